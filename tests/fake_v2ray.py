@@ -0,0 +1,78 @@
+"""
+Stand-in for v2ray in the balancer tests: an http inbound which sends every request
+through the upstream with the lowest probe latency, like the leastPing balancer
+"""
+import json
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import urlsplit
+
+UPSTREAM_PREFIX = 'upstream-'
+
+
+def tunnel(upstream, host, port):
+    sock = socket.create_connection(('127.0.0.1', upstream), 5)
+    sock.sendall('CONNECT {0}:{1} HTTP/1.1\r\nHost: {0}:{1}\r\n\r\n'.format(host, port).encode())
+    if not sock.recv(4096).startswith(b'HTTP/1.1 200'):
+        raise OSError('tunnel through {} failed'.format(upstream))
+
+    return sock
+
+
+def fetch(upstream, url):
+    parts = urlsplit(url)
+    with tunnel(upstream, parts.hostname, parts.port) as sock:
+        sock.sendall('GET {} HTTP/1.0\r\n\r\n'.format(parts.path or '/').encode())
+        response = b''
+        data = sock.recv(4096)
+        while data:
+            response += data
+            data = sock.recv(4096)
+
+    return response
+
+
+def main():
+    with open(sys.argv[sys.argv.index('-config') + 1]) as file:
+        config = json.load(file)
+
+    upstreams = [_['settings']['servers'][0]['port'] for _ in config['outbounds']
+                 if _.get('tag', '').startswith(UPSTREAM_PREFIX)]
+    probe_url = config['observatory']['probeURL']
+    interval = int(config['observatory']['probeInterval'].rstrip('s'))
+    latency = {_: float('inf') for _ in upstreams}
+
+    def _probe():
+        while True:
+            for upstream in upstreams:
+                start = time.monotonic()
+                try:
+                    fetch(upstream, probe_url)
+                    latency[upstream] = time.monotonic() - start
+                except OSError:
+                    latency[upstream] = float('inf')
+            time.sleep(interval)
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.0'
+
+        def do_GET(self):
+            self.wfile.write(fetch(min(upstreams, key=lambda _: latency[_]), self.path))
+
+        def log_message(self, *args):
+            pass
+
+    class _Server(ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+
+    threading.Thread(target=_probe, daemon=True).start()
+    inbound = config['inbounds'][0]
+    _Server((inbound['listen'], inbound['port']), _Handler).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
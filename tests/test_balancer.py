@@ -0,0 +1,87 @@
+import os
+import shutil
+import socket
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v2rayHelper import BalancerHarness, ConfigHelper, UpstreamStandIn  # noqa: E402
+
+
+class UpstreamStandInTest(unittest.TestCase):
+    """
+    CONNECT tunnels through a stand-in to a local target
+    """
+
+    def setUp(self):
+        self.target = BalancerHarness._start_target()
+        self.port = self.target.server_address[1]
+        self.stand_in = UpstreamStandIn(100)
+        self.stand_in.start()
+
+    def tearDown(self):
+        self.target.shutdown()
+
+    def _get(self):
+        start = time.monotonic()
+        with socket.create_connection(('127.0.0.1', self.stand_in.get_port()), 5) as sock:
+            sock.sendall('CONNECT 127.0.0.1:{0} HTTP/1.1\r\nHost: 127.0.0.1:{0}\r\n\r\n'.format(self.port).encode())
+            self.assertTrue(sock.recv(4096).startswith(b'HTTP/1.1 200'))
+            sock.sendall(b'GET / HTTP/1.0\r\n\r\n')
+            self.assertTrue(sock.recv(4096).startswith(b'HTTP/1.0 204'))
+
+        return time.monotonic() - start
+
+    def test_delay_and_count(self):
+        self.assertGreaterEqual(self._get(), 0.1)
+        self.stand_in.set_delay(10)
+        self.assertLess(self._get(), 0.1)
+
+        self.assertEqual(2, self.stand_in.get_count(self.port))
+        self.stand_in.reset()
+        self.assertEqual(0, self.stand_in.get_count(self.port))
+
+    def test_reject_plain_requests(self):
+        with socket.create_connection(('127.0.0.1', self.stand_in.get_port()), 5) as sock:
+            sock.sendall(b'GET / HTTP/1.1\r\n\r\n')
+            self.assertTrue(sock.recv(4096).startswith(b'HTTP/1.1 405'))
+
+
+class BalancerHarnessTest(unittest.TestCase):
+    def test_config(self):
+        stand_ins = [UpstreamStandIn(_) for _ in BalancerHarness.DELAYS]
+        config = BalancerHarness('v2ray')._build_config(10808, 8080, stand_ins)
+
+        upstreams = [_ for _ in config['outbounds'] if _['tag'].startswith(ConfigHelper.UPSTREAM_PREFIX)]
+        self.assertEqual([_.get_port() for _ in stand_ins],
+                         [_['settings']['servers'][0]['port'] for _ in upstreams])
+        self.assertEqual('http://127.0.0.1:8080/generate_204', config['observatory']['probeURL'])
+        self.assertEqual({'type': 'field', 'network': 'tcp,udp', 'balancerTag': ConfigHelper.BALANCER_TAG},
+                         config['routing']['rules'][-1])
+
+    def test_harness(self):
+        # a python stand-in for v2ray, executable so it is started like the real binary
+        fake = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_v2ray.py')
+        wrapper = os.path.join(self._get_temp(), 'v2ray')
+        with open(wrapper, 'w') as file:
+            file.write('#!/bin/sh\nexec "{}" "{}" "$@"\n'.format(sys.executable, fake))
+        os.chmod(wrapper, 0o755)
+
+        self.assertEqual(0, BalancerHarness(wrapper, requests=10).run())
+
+    @unittest.skipUnless(shutil.which('v2ray'), 'v2ray is not installed')
+    def test_traffic_follows_the_fastest_upstream(self):
+        self.assertEqual(0, BalancerHarness(shutil.which('v2ray'), requests=10).run())
+
+    def _get_temp(self):
+        import tempfile
+
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path, True)
+        return path
+
+
+if __name__ == '__main__':
+    unittest.main()
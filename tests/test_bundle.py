@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v2rayHelper import Bundle, Downloader, OSHandler, V2RayAPI, V2rayHelperException  # noqa: E402
+
+
+class BundleTest(unittest.TestCase):
+    VERSION = 'v4.22.1'
+    ASSET = 'v2ray-linux-64.zip'
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp, True)
+        self.addCleanup(setattr, Downloader, '_bundle', None)
+
+        self.release_url = OSHandler._get_v2ray_down_url([self.VERSION, self.ASSET])
+        self.release = b'PK release zip'
+        self.files = {
+            V2RayAPI.API_URL: json.dumps({'tag_name': self.VERSION, 'prerelease': False,
+                                          'assets': [{'name': self.ASSET}]}).encode(),
+            self.release_url: self.release,
+            '{}.dgst'.format(self.release_url): 'SHA1= {}\n'.format(hashlib.sha1(self.release).hexdigest()).encode()
+        }
+        for name in Bundle.MISC_FILES:
+            self.files[OSHandler._get_github_url('misc/{}'.format(name))] = name.encode()
+
+    def _write(self, path, files, corrupted=()):
+        with zipfile.ZipFile(path, 'w') as bundle:
+            index = {}
+            for number, (url, data) in enumerate(sorted(files.items())):
+                name = 'member/{}'.format(number)
+                bundle.writestr(name, data)
+                sha256 = '0' * 64 if url in corrupted else hashlib.sha256(data).hexdigest()
+                index[url] = {'name': name, 'size': len(data), 'sha256': sha256}
+            bundle.writestr(Bundle.INDEX, json.dumps({'version': self.VERSION, 'created': 'now', 'files': index}))
+
+        return path
+
+    def test_read_and_extract(self):
+        bundle = Bundle(self._write(os.path.join(self.temp, 'bundle.zip'), self.files))
+
+        self.assertEqual(self.files[V2RayAPI.API_URL], bundle.read(V2RayAPI.API_URL))
+        bundle.extract(self.release_url, os.path.join(self.temp, self.ASSET))
+        with open(os.path.join(self.temp, self.ASSET), 'rb') as file:
+            self.assertEqual(self.release, file.read())
+        with self.assertRaises(V2rayHelperException):
+            bundle.read('https://example.com/missing')
+
+    def test_corrupted_member(self):
+        bundle = Bundle(self._write(os.path.join(self.temp, 'bundle.zip'), self.files, [self.release_url]))
+
+        with self.assertRaises(V2rayHelperException):
+            bundle.read(self.release_url)
+        with self.assertRaises(V2rayHelperException):
+            bundle.extract(self.release_url, os.path.join(self.temp, self.ASSET))
+        self.assertFalse(os.path.exists(os.path.join(self.temp, self.ASSET)))
+
+    def test_invalid_bundle(self):
+        path = os.path.join(self.temp, 'bundle.zip')
+        with open(path, 'wb') as file:
+            file.write(b'not a zip')
+
+        with self.assertRaises(V2rayHelperException):
+            Bundle(path)
+
+    def test_create(self):
+        # every request of create is served from a source bundle
+        Downloader.use_bundle(Bundle(self._write(os.path.join(self.temp, 'source.zip'), self.files)))
+        api = V2RayAPI()
+        api.fetch()
+
+        path = os.path.join(self.temp, 'bundle.zip')
+        Bundle.create(path, api, 'linux', ['x86_64'])
+
+        bundle = Bundle(path)
+        for url, data in self.files.items():
+            self.assertEqual(data, bundle.read(url))
+        with zipfile.ZipFile(path) as file:
+            self.assertEqual(['v2ray-linux-64.zip'], json.loads(file.read(Bundle.INDEX).decode())['platforms'])
+
+    def test_create_validates_the_release(self):
+        self.files[self.release_url] = b'PK corrupted download'
+        Downloader.use_bundle(Bundle(self._write(os.path.join(self.temp, 'source.zip'), self.files)))
+        api = V2RayAPI()
+        api.fetch()
+
+        path = os.path.join(self.temp, 'bundle.zip')
+        with self.assertRaises(V2rayHelperException):
+            Bundle.create(path, api, 'linux', ['x86_64'])
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import bz2
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v2rayHelper import Delta, V2rayHelperException  # noqa: E402
+
+
+def _offtout(value):
+    data = bytearray(abs(value).to_bytes(8, 'little'))
+    if value < 0:
+        data[7] |= 0x80
+    return bytes(data)
+
+
+def _patch(controls, diff, extra, new_size):
+    """
+    BSDIFF40 patch made of (add, copy, seek) control triples
+    """
+    ctrl = bz2.compress(b''.join(_offtout(_) for control in controls for _ in control))
+    diff = bz2.compress(diff)
+    return b'BSDIFF40' + _offtout(len(ctrl)) + _offtout(len(diff)) + _offtout(new_size) + ctrl + diff + \
+        bz2.compress(extra)
+
+
+class BspatchTest(unittest.TestCase):
+    def test_unchanged(self):
+        old = bytes(range(256)) * 4
+        self.assertEqual(old, Delta.bspatch(old, _patch([(len(old), 0, 0)], bytes(len(old)), b'', len(old))))
+
+    def test_bytes_are_added_modulo_256(self):
+        self.assertEqual(b'\x01\x00\x80', Delta.bspatch(b'\xff\x01\x7f', _patch([(3, 0, 0)], b'\x02\xff\x01', b'', 3)))
+
+    def test_extra_and_seek(self):
+        # copy 'ab', insert 'XY', go back to the start and copy 'abc'
+        patch = _patch([(2, 2, -2), (3, 0, 0)], bytes(5), b'XY', 7)
+        self.assertEqual(b'abXYabc', Delta.bspatch(b'abcd', patch))
+
+    def test_old_file_is_padded_with_zeros(self):
+        patch = _patch([(4, 0, 0)], b'\x01\x01\x01\x01', b'', 4)
+        self.assertEqual(b'b\x01\x01\x01', Delta.bspatch(b'a', patch))
+
+    def test_invalid_patch(self):
+        with self.assertRaises(V2rayHelperException):
+            Delta.bspatch(b'old', b'BSDIFF41' + bytes(24))
+        with self.assertRaises(V2rayHelperException):
+            Delta.bspatch(b'old', _patch([(3, 0, 0)], bytes(3), b'', 4))
+
+
+class ApplyTest(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp, True)
+
+    def test_rebuild_from_kept_release(self):
+        release = os.path.join(self.temp, 'v2ray.zip')
+        with open(release, 'wb') as file:
+            file.write(b'abcd')
+        Delta.keep(release, self.temp)
+
+        delta = os.path.join(self.temp, Delta.get_name('v2ray.zip', 'v4.1.0'))
+        with zipfile.ZipFile(delta, 'w', zipfile.ZIP_STORED) as file:
+            file.writestr(Delta.PATCH, _patch([(4, 1, 0)], b'\x01\x00\x00\x00', b'e', 5))
+            file.writestr(Delta.INDEX, json.dumps({'from': '4.1.0', 'to': '4.2.0', 'size': 5}))
+
+        output = os.path.join(self.temp, 'rebuilt.zip')
+        self.assertEqual('4.2.0', Delta.apply(delta, self.temp, output)['to'])
+        with open(output, 'rb') as file:
+            self.assertEqual(b'bbcde', file.read())
+
+    def test_release_is_not_kept(self):
+        delta = os.path.join(self.temp, 'v2ray.zip.from-4.1.0.delta')
+        with zipfile.ZipFile(delta, 'w') as file:
+            file.writestr(Delta.PATCH, b'')
+            file.writestr(Delta.INDEX, '{}')
+
+        with self.assertRaises(V2rayHelperException):
+            Delta.apply(delta, self.temp, os.path.join(self.temp, 'rebuilt.zip'))
+
+
+if __name__ == '__main__':
+    unittest.main()
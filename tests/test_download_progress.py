@@ -0,0 +1,86 @@
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v2rayHelper import Downloader, StepScheduler  # noqa: E402
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    CHUNKS = 10
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', str(self.CHUNKS * 1024))
+        self.end_headers()
+        for _ in range(self.CHUNKS):
+            self.wfile.write(b'\0' * 1024)
+            self.wfile.flush()
+            time.sleep(0.05)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(HTTPServer):
+    # ThreadingHTTPServer is python 3.7+
+    def process_request(self, request, client_address):
+        threading.Thread(target=self._handle, args=(request, client_address), daemon=True).start()
+
+    def _handle(self, request, client_address):
+        self.finish_request(request, client_address)
+        self.shutdown_request(request)
+
+
+class DownloadProgressTest(unittest.TestCase):
+    """
+    parallel downloads must not draw their progress bars over each other
+    """
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp, True)
+
+        self.server = _Server(('127.0.0.1', 0), _SlowHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def _save(self, name):
+        url = 'http://127.0.0.1:{}/{}'.format(self.server.server_address[1], name)
+        return lambda: Downloader(url).save(name, self.temp)
+
+    def test_one_progress_bar(self):
+        scheduler = StepScheduler('test')
+        for name in ('v2ray.zip', 'geoip.dat', 'geosite.dat'):
+            scheduler.add(name, self._save(name))
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            scheduler.run()
+
+        drawn = set(_.split()[1] for _ in output.getvalue().split('\r') if _.startswith('Fetching:'))
+        self.assertEqual(1, len(drawn))
+        self.assertEqual(['geoip.dat', 'geosite.dat', 'v2ray.zip'], sorted(os.listdir(self.temp)))
+        self.assertIsNone(Downloader._progress_owner)
+
+    def test_next_download_draws_again(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self._save('v2ray.zip')()
+            self._save('geoip.dat')()
+
+        self.assertIn('Fetching: v2ray.zip', output.getvalue())
+        self.assertIn('Fetching: geoip.dat', output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import functools
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v2rayHelper import Downloader, GeoDataUpdater, Manifest, V2rayHelperException  # noqa: E402
+
+
+class GeoDataUpdaterTest(unittest.TestCase):
+    """
+    one file failing must not keep the other one from being updated and recorded
+    """
+
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.target = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source, True)
+        self.addCleanup(shutil.rmtree, self.target, True)
+
+        handler = functools.partial(SimpleHTTPRequestHandler, directory=self.source)
+        handler.log_message = lambda *args: None
+        self.server = HTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.shutdown)
+
+        Downloader.set_retry_policy(retries=0)
+        for name in GeoDataUpdater.SOURCES:
+            with open(os.path.join(self.target, name), 'wb') as file:
+                file.write(b'old')
+        manifest = Manifest('4.1.0')
+        for name in GeoDataUpdater.SOURCES:
+            manifest.add(self.target, name)
+        manifest.save(self.target)
+
+    def _publish(self, name, data, checksum=None):
+        with open(os.path.join(self.source, name), 'wb') as file:
+            file.write(data)
+        with open(os.path.join(self.source, '{}.sha256sum'.format(name)), 'w') as file:
+            file.write('{}  {}\n'.format(checksum or hashlib.sha256(data).hexdigest(), name))
+
+    def _update(self):
+        updater = GeoDataUpdater(self.target, 'http://127.0.0.1:{}'.format(self.server.server_address[1]))
+        with self.assertRaises(V2rayHelperException):
+            updater.update()
+
+        with open(os.path.join(self.target, GeoDataUpdater.STATE_FILE)) as file:
+            return updater.get_changed(), json.load(file), Manifest.load(self.target)
+
+    def _assert_updated(self, name, changed, state, manifest):
+        self.assertEqual([name], changed)
+        self.assertEqual([name], list(state))
+        with open(os.path.join(self.target, name), 'rb') as file:
+            self.assertEqual(b'new', file.read())
+        self.assertEqual(3, manifest.get(name)['size'])
+        self.assertEqual([], manifest.verify(self.target, True))
+
+    def test_second_file_fails_validation(self):
+        self._publish('geoip.dat', b'new')
+        self._publish('geosite.dat', b'new', '0' * 64)
+
+        self._assert_updated('geoip.dat', *self._update())
+
+    def test_first_file_is_missing(self):
+        self._publish('geosite.dat', b'new')
+
+        self._assert_updated('geosite.dat', *self._update())
+
+    def test_refreshed_files_are_reported(self):
+        self._publish('geoip.dat', b'new')
+        self._publish('geosite.dat', b'new')
+
+        updater = GeoDataUpdater(self.target, 'http://127.0.0.1:{}'.format(self.server.server_address[1]))
+        updater.update()
+        self.assertEqual(['geoip.dat', 'geosite.dat'], updater.get_refreshed(Manifest.load(self.target)))
+
+        # a release file placed afterwards is no refreshed file any more
+        with open(os.path.join(self.target, 'geoip.dat'), 'wb') as file:
+            file.write(b'release')
+        manifest = Manifest.load(self.target)
+        manifest.add(self.target, 'geoip.dat')
+        self.assertEqual(['geosite.dat'], updater.get_refreshed(manifest))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v2rayHelper import GeoData, V2rayHelperException  # noqa: E402
+
+
+def _entry(code, payload=b''):
+    # GeoSite/GeoIP: code is field 1, the domains or cidrs follow
+    return GeoData.write_field(1, GeoData.write_field(1, code.encode()) + payload)
+
+
+class GeoDataTest(unittest.TestCase):
+    # longer than 127 bytes, the length takes two varint bytes
+    LARGE = GeoData.write_field(2, b'x' * 300)
+
+    def test_subset(self):
+        data = _entry('cn', b'\x10\x01') + _entry('US', self.LARGE) + _entry('private')
+
+        subset, missing = GeoData.subset(data, ['US', 'CN', 'JP'])
+        self.assertEqual(_entry('cn', b'\x10\x01') + _entry('US', self.LARGE), subset)
+        self.assertEqual(['JP'], missing)
+
+    def test_subset_skips_other_fields(self):
+        data = GeoData.write_field(2, 7) + _entry('CN') + GeoData.write_field(3, b'unknown')
+
+        self.assertEqual((_entry('CN'), []), GeoData.subset(data, ['CN']))
+        self.assertEqual((b'', ['US']), GeoData.subset(data, ['US']))
+
+    def test_invalid_wire_type(self):
+        with self.assertRaises(V2rayHelperException):
+            GeoData.subset(b'\x0b', ['CN'])
+
+    def test_shrink(self):
+        temp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp, True)
+        path = os.path.join(temp, 'geoip.dat')
+        with open(path, 'wb') as file:
+            file.write(_entry('CN') + _entry('US', self.LARGE))
+        os.chmod(path, 0o640)
+
+        before, after, missing = GeoData.shrink(path, ['CN'])
+        self.assertEqual((len(_entry('CN') + _entry('US', self.LARGE)), len(_entry('CN')), []),
+                         (before, after, missing))
+        with open(path, 'rb') as file:
+            self.assertEqual(_entry('CN'), file.read())
+        self.assertEqual(0o640, os.stat(path).st_mode & 0o7777)
+
+    def test_get_codes(self):
+        config = {'routing': {'rules': [
+            {'ip': ['geoip:cn', 'geoip:!private', '10.0.0.0/8']},
+            {'domain': ['geosite:google@ads', 'ext:geosite.dat:netflix', 'ext:custom.dat:foo', 'domain:example.com']}
+        ]}}
+
+        self.assertEqual({'geoip.dat': {'CN', 'PRIVATE'}, 'geosite.dat': {'GOOGLE', 'NETFLIX'}},
+                         GeoData.get_codes(config))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v2rayHelper import Downloader, HedgedRequest  # noqa: E402
+
+
+class _Bucket:
+    def __init__(self):
+        self.consumed = 0
+
+    def consume(self, amount):
+        self.consumed += amount
+
+
+class HedgedRequestTest(unittest.TestCase):
+    """
+    a hedged request shares the rate limit and can be cancelled while its read is blocked
+    """
+    SIZE = 300000
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp, True)
+
+        self.server = socket.socket()
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(1)
+        self.addCleanup(self.server.close)
+        self.url = 'http://127.0.0.1:{}/v2ray.zip'.format(self.server.getsockname()[1])
+
+        self.addCleanup(setattr, Downloader, '_bucket', Downloader._bucket)
+        self.addCleanup(setattr, Downloader, '_read_timeout', Downloader._read_timeout)
+        Downloader._bucket = _Bucket()
+
+    def _serve(self, stall):
+        connection, _ = self.server.accept()
+        with connection:
+            connection.recv(4096)
+            header = 'HTTP/1.1 206 Partial Content\r\nContent-Length: {}\r\nConnection: close\r\n\r\n'
+            connection.sendall(header.format(self.SIZE).encode())
+            if stall:
+                connection.sendall(b'\0' * 1024)
+                time.sleep(5)
+            else:
+                connection.sendall(b'\0' * self.SIZE)
+
+    def _start(self, stall):
+        threading.Thread(target=self._serve, args=(stall,), daemon=True).start()
+        hedge = HedgedRequest(Downloader(self.url, True), 100, 100 + self.SIZE, os.path.join(self.temp, 'hedge'))
+        hedge.start()
+        return hedge
+
+    def test_reads_are_throttled(self):
+        hedge = self._start(False)
+
+        self.assertTrue(hedge.wait())
+        self.assertEqual(self.SIZE, Downloader._bucket.consumed)
+
+    def test_cancel_does_not_wait_for_the_read_timeout(self):
+        Downloader._read_timeout = 30
+        hedge = self._start(True)
+        # wait until the read is blocked on the stalled response
+        while hedge._response is None:
+            time.sleep(0.05)
+        time.sleep(0.2)
+
+        started = time.monotonic()
+        hedge.cancel()
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertFalse(hedge.is_finished())
+        self.assertFalse(os.path.exists(os.path.join(self.temp, 'hedge')))
+
+
+if __name__ == '__main__':
+    unittest.main()
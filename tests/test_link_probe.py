@@ -0,0 +1,53 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v2rayHelper import EchoPeer, LinkProbe, V2rayHelperException  # noqa: E402
+
+
+class LinkProbeTest(unittest.TestCase):
+    """
+    LinkProbe against an EchoPeer emulating a link on loopback
+    """
+
+    def _measure(self, **link):
+        peer = EchoPeer(**link)
+        peer.start()
+
+        return LinkProbe(peer.get_address(), pings=50, interval=0.005, burst_time=0.5).measure()
+
+    def test_rtt_and_bandwidth(self):
+        result = self._measure(rtt=0.05, rate=1024 * 1024)
+
+        self.assertGreaterEqual(result['rtt'], 50)
+        self.assertLess(result['rtt'], 150)
+        self.assertEqual(0, result['loss'])
+        self.assertGreater(result['bandwidth'], 0.5 * 1024 * 1024)
+        self.assertLess(result['bandwidth'], 1.5 * 1024 * 1024)
+
+        # 80% of the measured rate fits into the emulated queue
+        self.assertLess(result['load_loss'], 0.05)
+
+    def test_random_loss(self):
+        result = self._measure(loss=0.3)
+
+        self.assertGreater(result['loss'], 0.1)
+        self.assertLess(result['loss'], 0.5)
+
+    def test_no_peer(self):
+        import socket
+
+        # bound but never answering
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(('127.0.0.1', 0))
+        try:
+            with self.assertRaises(V2rayHelperException):
+                LinkProbe(sock.getsockname(), pings=5, interval=0.001, burst_time=0.1).measure()
+        finally:
+            sock.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v2rayHelper import LogRotation  # noqa: E402
+
+MB = 1024 * 1024
+PATHS = ['/var/log/v2ray/error.log', '/var/log/v2ray/access.log']
+
+
+def _statvfs(total, free):
+    return os.statvfs_result((4096, 4096, total // 4096, free // 4096, free // 4096, 0, 0, 0, 0, 255))
+
+
+class LogRotationTest(unittest.TestCase):
+    def _budget(self, total, free):
+        with mock.patch('os.statvfs', return_value=_statvfs(total, free)):
+            return LogRotation.get_budget(tempfile.gettempdir())
+
+    def test_budget(self):
+        # 2% of a 20G disk, 10% of the free space of a full one
+        self.assertEqual(int(20480 * MB * 0.02), self._budget(20480 * MB, 10240 * MB))
+        self.assertEqual(int(2048 * MB * 0.1), self._budget(40960 * MB, 2048 * MB))
+
+    def test_budget_limits(self):
+        self.assertEqual(LogRotation.MIN_BUDGET, self._budget(512 * MB, 100 * MB))
+        self.assertEqual(LogRotation.MAX_BUDGET, self._budget(1024 * 1024 * MB, 1024 * 1024 * MB))
+
+    def test_budget_of_a_missing_folder(self):
+        path = os.path.join(tempfile.gettempdir(), 'missing', 'v2ray')
+        with mock.patch('os.statvfs', return_value=_statvfs(20480 * MB, 10240 * MB)) as statvfs:
+            LogRotation.get_budget(path)
+
+        statvfs.assert_called_once_with(tempfile.gettempdir())
+
+    def test_size_fits_the_budget(self):
+        budget = 100 * MB
+        size = LogRotation.get_size(PATHS, budget)
+
+        # live file, uncompressed newest rotation and the compressed older ones of every log
+        used = len(PATHS) * size * (2 + (LogRotation.KEEP - 1) * LogRotation.COMPRESSION_RATIO)
+        self.assertLessEqual(used, budget)
+        self.assertGreater(used, budget * 0.99)
+        self.assertEqual(2 * size, LogRotation.get_size(PATHS[:1], budget))
+
+    def test_render_logrotate(self):
+        text = LogRotation.render_logrotate(PATHS, 100 * MB, 'v2ray-log-sampler.service')
+        error, access = text.split('}\n')[:2]
+
+        size = 'size {}k'.format(LogRotation.get_size(PATHS, 100 * MB) // 1024)
+        self.assertTrue(error.startswith('/var/log/v2ray/error.log {'))
+        self.assertIn(size, error)
+        self.assertIn('copytruncate', error)
+        self.assertNotIn('postrotate', error)
+
+        self.assertTrue(access.startswith('/var/log/v2ray/access.log {'))
+        self.assertIn(size, access)
+        self.assertIn('systemctl kill -s HUP v2ray-log-sampler.service', access)
+        self.assertNotIn('copytruncate', access)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v2rayHelper import Manifest  # noqa: E402
+
+
+class ManifestTest(unittest.TestCase):
+    FILES = {'v2ray': b'binary', 'geoip.dat': b'ip', 'geosite.dat': b'site'}
+
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp, True)
+
+        self.manifest = Manifest()
+        for name, data in self.FILES.items():
+            self._write(name, data)
+            self.manifest.add(self.temp, name)
+
+    def _write(self, name, data, mode=0o644):
+        path = os.path.join(self.temp, name)
+        with open(path, 'wb') as file:
+            file.write(data)
+        os.chmod(path, mode)
+
+    def _zip(self, files):
+        path = os.path.join(self.temp, 'release.zip')
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as file:
+            for name, data in files.items():
+                file.writestr(name, data)
+
+        return zipfile.ZipFile(path)
+
+    def test_save_and_load(self):
+        self.manifest.set_version('v4.22.1')
+        self.manifest.save(self.temp)
+
+        manifest = Manifest.load(self.temp)
+        self.assertEqual('4.22.1', manifest.get_version())
+        self.assertEqual(zlib.crc32(b'binary'), manifest.get('v2ray')['crc32'])
+        self.assertIsNone(Manifest.load(os.path.join(self.temp, 'missing')))
+
+    def test_diff(self):
+        with self._zip({'v2ray': b'binary 2', 'geoip.dat': b'ip', 'v2ctl': b'control', 'doc/': b''}) as zip_ref:
+            changed, removed = self.manifest.diff(zip_ref)
+
+        self.assertEqual(['v2ray', 'v2ctl'], [_.filename for _ in changed])
+        self.assertEqual(['geosite.dat'], removed)
+
+    def test_diff_with_filter(self):
+        with self._zip(dict(self.FILES, v2ctl=b'control')) as zip_ref:
+            changed, removed = self.manifest.diff(zip_ref, lambda name: name != 'geosite.dat')
+
+        self.assertEqual(['v2ctl'], [_.filename for _ in changed])
+        self.assertEqual(['geosite.dat'], removed)
+
+    def test_diff_compares_subsets_by_source(self):
+        # geoip.dat is installed as a subset of the release file
+        self._write('geoip.dat', b'i')
+        self.manifest.set('geoip.dat', dict(Manifest._describe(os.path.join(self.temp, 'geoip.dat')), source={
+            'size': 2, 'crc32': zlib.crc32(b'ip'), 'codes': ['CN']
+        }))
+
+        with self._zip(self.FILES) as zip_ref:
+            self.assertEqual([], self.manifest.diff(zip_ref)[0])
+        with self._zip(dict(self.FILES, **{'geoip.dat': b'IP'})) as zip_ref:
+            self.assertEqual(['geoip.dat'], [_.filename for _ in self.manifest.diff(zip_ref)[0]])
+
+    def test_verify(self):
+        self.assertEqual([], self.manifest.verify(self.temp, True))
+
+        os.remove(os.path.join(self.temp, 'v2ray'))
+        self._write('geoip.dat', b'ip', 0o600)
+        self._write('geosite.dat', b'SITE')
+        self.assertEqual(['geoip.dat: mode 600 != 644', 'v2ray: missing'], self.manifest.verify(self.temp))
+        self.assertEqual(['geoip.dat: mode 600 != 644', 'geosite.dat: sha256 mismatch', 'v2ray: missing'],
+                         self.manifest.verify(self.temp, True))
+
+    def test_verify_size(self):
+        self._write('v2ray', b'binary 2')
+        self.assertEqual(['v2ray: size 8 != 6'], self.manifest.verify(self.temp))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v2rayHelper import MetricsExporter  # noqa: E402
+
+# output of v2ctl api StatsService.QueryStats
+QUERY_OUTPUT = '''stat: <
+  name: "inbound>>>vmess-in>>>traffic>>>uplink"
+  value: 1024
+>
+stat: <
+  name: "inbound>>>vmess-in>>>traffic>>>downlink"
+  value: 4096
+>
+stat: <
+  name: "user>>>a\\"b@example.com>>>traffic>>>uplink"
+>
+stat: <
+  name: "user>>>caf\\303\\251@example.com>>>traffic>>>downlink"
+  value: 7
+>
+stat: <
+  name: "inbound>>>api>>>traffic>>>other"
+  value: 1
+>
+'''
+
+
+class MetricsExporterTest(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp, True)
+        self.path = os.path.join(self.temp, 'v2ray.prom')
+
+    def test_render(self):
+        lines = MetricsExporter(self.path)._render(QUERY_OUTPUT, 0.25).splitlines()
+
+        self.assertIn('v2ray_up 1', lines)
+        self.assertIn('v2ray_exporter_query_duration_seconds 0.250000', lines)
+        self.assertIn('v2ray_traffic_uplink_bytes_total{dimension="inbound",target="vmess-in"} 1024', lines)
+        self.assertIn('v2ray_traffic_downlink_bytes_total{dimension="inbound",target="vmess-in"} 4096', lines)
+        # the escapes of v2ctl are decoded, a counter without value has not counted anything yet
+        self.assertIn('v2ray_traffic_uplink_bytes_total{dimension="user",target="a\\"b@example.com"} 0', lines)
+        self.assertIn('v2ray_traffic_downlink_bytes_total{dimension="user",target="caf\u00e9@example.com"} 7', lines)
+        self.assertEqual([], [_ for _ in lines if 'other' in _ or 'target="api"' in _])
+        self.assertEqual(1, lines.count('# TYPE v2ray_traffic_uplink_bytes_total counter'))
+
+    def test_render_without_stats(self):
+        text = MetricsExporter(self.path)._render('', 0)
+
+        self.assertTrue(text.endswith('# TYPE v2ray_traffic_downlink_bytes_total counter\n'))
+        self.assertNotIn('v2ray_traffic_uplink_bytes_total{', text)
+
+    def test_export(self):
+        exporter = MetricsExporter(self.path)
+        exporter._query = lambda: QUERY_OUTPUT
+        exporter.export()
+
+        with open(self.path) as file:
+            self.assertIn('v2ray_up 1\n', file.read())
+        self.assertEqual(['v2ray.prom'], os.listdir(self.temp))
+        self.assertEqual(0o644, os.stat(self.path).st_mode & 0o7777)
+
+    def test_export_when_the_api_is_down(self):
+        def _query():
+            raise subprocess.CalledProcessError(1, 'v2ctl')
+
+        exporter = MetricsExporter(self.path)
+        exporter._query = _query
+        exporter.export()
+
+        with open(self.path) as file:
+            self.assertEqual('# TYPE v2ray_up gauge\nv2ray_up 0\n', file.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
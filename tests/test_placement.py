@@ -0,0 +1,91 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v2rayHelper import Manifest, Placement  # noqa: E402
+
+
+def _get_mode(name):
+    return 0o755 if name == 'v2ray' else 0o644
+
+
+class PlacementTest(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp, True)
+        self.target = os.path.join(self.temp, 'v2ray')
+
+    def _zip(self, files):
+        path = os.path.join(self.temp, 'release-{}.zip'.format(len(os.listdir(self.temp))))
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as file:
+            for name, data in files.items():
+                file.writestr(name, data)
+
+        return zipfile.ZipFile(path)
+
+    def _read(self, name):
+        with open(os.path.join(self.target, name), 'rb') as file:
+            return file.read()
+
+    def test_install_replaces_the_target(self):
+        os.mkdir(self.target)
+        with open(os.path.join(self.target, 'obsolete'), 'w') as file:
+            file.write('old')
+
+        with self._zip({'v2ray': b'binary', 'doc/readme.md': b'readme'}) as zip_ref:
+            files = Placement(self.target, _get_mode).install(zip_ref)
+
+        self.assertEqual(['doc', 'v2ray'], sorted(os.listdir(self.target)))
+        self.assertEqual(b'binary', self._read('v2ray'))
+        self.assertEqual(0o755, os.stat(os.path.join(self.target, 'v2ray')).st_mode & 0o7777)
+        self.assertEqual(0o644, os.stat(os.path.join(self.target, 'doc/readme.md')).st_mode & 0o7777)
+        # the entries describe the written files like the manifest does
+        for name in files:
+            self.assertEqual(Manifest._describe(os.path.join(self.target, name)), files[name])
+        # neither staging nor backup is left behind
+        self.assertEqual(sorted(['v2ray'] + [_ for _ in os.listdir(self.temp) if _.endswith('.zip')]),
+                         sorted(os.listdir(self.temp)))
+
+    def test_install_selected_files(self):
+        with self._zip({'v2ray': b'binary', 'config.json': b'{}'}) as zip_ref:
+            files = Placement(self.target, _get_mode).install(zip_ref, lambda name: name != 'config.json')
+
+        self.assertEqual(['v2ray'], list(files))
+        self.assertEqual(['v2ray'], os.listdir(self.target))
+
+    def test_install_removes_stale_siblings(self):
+        process = subprocess.Popen(['true'])
+        process.wait()
+        stale = os.path.join(self.temp, '.v2ray.staging-{}'.format(process.pid))
+        os.mkdir(stale)
+
+        with self._zip({'v2ray': b'binary'}) as zip_ref:
+            Placement(self.target, _get_mode).install(zip_ref)
+
+        self.assertFalse(os.path.exists(stale))
+
+    def test_update_changed_files_only(self):
+        with self._zip({'v2ray': b'binary', 'geoip.dat': b'ip', 'obsolete': b'old'}) as zip_ref:
+            Placement(self.target, _get_mode).install(zip_ref)
+        unchanged = os.stat(os.path.join(self.target, 'geoip.dat')).st_ino
+
+        with self._zip({'v2ray': b'binary 2', 'geoip.dat': b'ip', 'new/geosite.dat': b'site'}) as zip_ref:
+            changed = [zip_ref.getinfo('v2ray'), zip_ref.getinfo('new/geosite.dat')]
+            files = Placement(self.target, _get_mode).update(zip_ref, changed, ['obsolete'])
+
+        self.assertEqual(['new/geosite.dat', 'v2ray'], sorted(files))
+        self.assertEqual(b'binary 2', self._read('v2ray'))
+        self.assertEqual(b'site', self._read('new/geosite.dat'))
+        self.assertEqual(unchanged, os.stat(os.path.join(self.target, 'geoip.dat')).st_ino)
+        self.assertFalse(os.path.exists(os.path.join(self.target, 'obsolete')))
+        self.assertEqual([], [_ for _ in os.listdir(self.target) if _.endswith('.v2tmp')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import ipaddress
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v2rayHelper import GeoData, RuleCompiler  # noqa: E402
+
+
+def _decode(data):
+    """
+    :return: [(field number, value)] of one message, nested messages stay bytes
+    """
+    return [(number, value if wire_type == 0 else bytes(value)) for number, wire_type, value in
+            GeoData._read_fields(memoryview(data))]
+
+
+class EncoderTest(unittest.TestCase):
+    def _entry(self, data):
+        fields = _decode(data)
+        self.assertEqual(1, len(fields))
+        self.assertEqual(1, fields[0][0])
+
+        return _decode(fields[0][1])
+
+    def test_encode_site(self):
+        fields = self._entry(RuleCompiler._encode_site('proxy', [('domain', 'example.com'), ('regexp', '^a+$'),
+                                                                 ('full', 'www.example.org'), ('keyword', 'ads')]))
+
+        self.assertEqual((1, b'PROXY'), fields[0])
+        self.assertEqual([[(1, 2), (2, b'example.com')], [(1, 1), (2, b'^a+$')],
+                          [(1, 3), (2, b'www.example.org')], [(1, 0), (2, b'ads')]],
+                         [_decode(value) for number, value in fields[1:]])
+
+    def test_encode_ip(self):
+        networks = [ipaddress.ip_network('10.0.0.0/8'), ipaddress.ip_network('2001:db8::/32')]
+        fields = self._entry(RuleCompiler._encode_ip('lan', networks))
+
+        self.assertEqual((1, b'LAN'), fields[0])
+        self.assertEqual([[(1, b'\x0a\0\0\0'), (2, 8)], [(1, b'\x20\x01\x0d\xb8' + bytes(12)), (2, 32)]],
+                         [_decode(value) for number, value in fields[1:]])
+
+    def test_encoded_entries_can_be_subset(self):
+        data = RuleCompiler._encode_site('a', [('domain', 'a.com')]) + RuleCompiler._encode_site('b', [])
+
+        self.assertEqual((RuleCompiler._encode_site('a', [('domain', 'a.com')]), []), GeoData.subset(data, ['A']))
+
+
+class ListTest(unittest.TestCase):
+    def test_parse_line(self):
+        self.assertIsNone(RuleCompiler._parse_line('  # comment'))
+        self.assertEqual(('domain', ('domain', 'example.com')), RuleCompiler._parse_line('Example.com @ads'))
+        self.assertEqual(('domain', ('regexp', '^A$')), RuleCompiler._parse_line('regexp:^A$'))
+        self.assertEqual(('domain', ('full', 'www.example.com')), RuleCompiler._parse_line('full:WWW.example.com'))
+        self.assertEqual(('ip', ipaddress.ip_network('10.0.0.0/8')), RuleCompiler._parse_line('10.1.2.3/8'))
+
+    def test_prune(self):
+        domains = {('domain', 'example.com'), ('domain', 'www.example.com'), ('full', 'example.com'),
+                   ('full', 'example.org'), ('keyword', 'example.com')}
+
+        self.assertEqual([('domain', 'example.com'), ('full', 'example.org'), ('keyword', 'example.com')],
+                         RuleCompiler._prune(domains))
+
+    def test_merge(self):
+        networks = [ipaddress.ip_network(_) for _ in ('10.0.0.0/9', '10.128.0.0/9', '10.1.0.0/16', '::1/128')]
+
+        self.assertEqual([ipaddress.ip_network('10.0.0.0/8'), ipaddress.ip_network('::1/128')],
+                         RuleCompiler._merge(networks))
+
+    def test_build(self):
+        temp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp, True)
+        os.mkdir(os.path.join(temp, RuleCompiler.RULES_DIR))
+        with open(os.path.join(temp, RuleCompiler.RULES_DIR, 'direct.txt'), 'w') as file:
+            file.write('example.com\nwww.example.com\n192.168.0.0/16\n')
+
+        compiler = RuleCompiler(temp, temp)
+        self.assertTrue(compiler.build())
+        self.assertFalse(compiler.build())
+
+        with open(os.path.join(temp, RuleCompiler.SITE_FILE), 'rb') as file:
+            self.assertEqual(RuleCompiler._encode_site('direct', [('domain', 'example.com')]), file.read())
+        with open(os.path.join(temp, RuleCompiler.IP_FILE), 'rb') as file:
+            self.assertEqual(RuleCompiler._encode_ip('direct', [ipaddress.ip_network('192.168.0.0/16')]), file.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+import unittest
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'v2rayHelper.py')
+
+
+class StatusImportsTest(unittest.TestCase):
+    """
+    --status is a local only action, the heavy modules are imported by the actions which need them
+    """
+    HEAVY = ['zipfile', 'urllib', 'hashlib', 'tempfile', 'inspect']
+
+    def test_status_imports(self):
+        result = subprocess.run([sys.executable, '-X', 'importtime', SCRIPT, '--status'],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+
+        # import time: self [us] | cumulative | imported package
+        imported = set(line.rsplit('|', 1)[1].strip().split('.')[0]
+                       for line in result.stderr.splitlines() if line.startswith('import time:'))
+        self.assertIn('json', imported)
+        self.assertEqual([], [_ for _ in self.HEAVY if _ in imported])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v2rayHelper import StepScheduler, V2rayHelperException  # noqa: E402
+
+
+class StepSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        self.lock = threading.Lock()
+
+    def _step(self, name, delay=0.0, result=None):
+        def _run():
+            with self.lock:
+                self.events.append(('start', name))
+            time.sleep(delay)
+            with self.lock:
+                self.events.append(('end', name))
+            return result
+
+        return _run
+
+    def _index(self, event, name):
+        return self.events.index((event, name))
+
+    def test_dependencies_finish_first(self):
+        scheduler = StepScheduler('test')
+        scheduler.add('download', self._step('download', 0.1, 'zip'))
+        scheduler.add('digest', self._step('digest', 0.05, 'dgst'))
+        scheduler.add('place', lambda: (scheduler.get_result('download'), scheduler.get_result('digest')),
+                      ['download', 'digest'])
+        scheduler.add('restart', self._step('restart'), ['place'])
+
+        results = scheduler.run()
+
+        self.assertEqual(('zip', 'dgst'), results['place'])
+        self.assertLess(self._index('end', 'download'), self._index('start', 'restart'))
+        self.assertLess(self._index('end', 'digest'), self._index('start', 'restart'))
+        self.assertEqual(['download', 'place', 'restart'], scheduler.get_critical_path())
+
+    def test_independent_steps_overlap(self):
+        scheduler = StepScheduler('test')
+        for name in ('a', 'b', 'c'):
+            scheduler.add(name, self._step(name, 0.2))
+
+        started = time.monotonic()
+        scheduler.run()
+
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual([('start', _) for _ in 'abc'], sorted(self.events[:3]))
+
+    def test_failure_stops_dependents(self):
+        def _fail():
+            time.sleep(0.05)
+            raise V2rayHelperException('download failed')
+
+        scheduler = StepScheduler('test')
+        scheduler.add('download', _fail)
+        scheduler.add('digest', self._step('digest', 0.1))
+        scheduler.add('place', self._step('place'), ['download', 'digest'])
+
+        with self.assertRaisesRegex(V2rayHelperException, 'download failed'):
+            scheduler.run()
+
+        # the running step is waited for, nothing depending on the failed one starts
+        self.assertIn(('end', 'digest'), self.events)
+        self.assertNotIn(('start', 'place'), self.events)
+
+    def test_undeclared_dependency(self):
+        scheduler = StepScheduler('test')
+
+        with self.assertRaises(V2rayHelperException):
+            scheduler.add('place', self._step('place'), ['download'])
+
+
+if __name__ == '__main__':
+    unittest.main()
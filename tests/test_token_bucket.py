@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v2rayHelper import TokenBucket  # noqa: E402
+
+KB = 1024
+BLOCK = 64 * KB
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TokenBucketTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        for name in ('monotonic', 'sleep'):
+            patcher = mock.patch.object(time, name, getattr(self.clock, name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _download(self, bucket, capacity, seconds):
+        """
+        read blocks from a link of the given capacity through the bucket
+        :return: [(time, bytes so far)]
+        """
+        started = self.clock.now
+        received = 0
+        progress = []
+        while self.clock.now - started < seconds:
+            self.clock.sleep(BLOCK / capacity)
+            received += BLOCK
+            bucket.consume(BLOCK)
+            progress.append((self.clock.now - started, received))
+
+        return progress
+
+    @staticmethod
+    def _received_at(progress, seconds):
+        return max(received for at, received in progress if at <= seconds)
+
+    def test_fixed_rate(self):
+        progress = self._download(TokenBucket(512 * KB), 10240 * KB, 10)
+
+        self.assertAlmostEqual(512 * KB, progress[-1][1] / progress[-1][0], delta=16 * KB)
+
+    def test_calibration_starts_low(self):
+        progress = self._download(TokenBucket(None, 0.5), 10240 * KB, 10)
+
+        # a second of unthrottled download would have been 10M
+        self.assertLess(self._received_at(progress, 1), 1024 * KB)
+        self.assertLess(self._received_at(progress, TokenBucket.CALIBRATION_TIME), 10240 * KB)
+
+    def test_calibration_finds_the_link_speed(self):
+        bucket = TokenBucket(None, 0.5)
+        self._download(bucket, 2048 * KB, 5)
+
+        self.assertFalse(bucket._calibrating)
+        self.assertAlmostEqual(1024 * KB, bucket._rate, delta=128 * KB)
+
+    def test_slow_link(self):
+        bucket = TokenBucket(None, 0.3)
+        self._download(bucket, 100 * KB, 5)
+
+        self.assertFalse(bucket._calibrating)
+        self.assertAlmostEqual(30 * KB, bucket._rate, delta=4 * KB)
+
+
+if __name__ == '__main__':
+    unittest.main()
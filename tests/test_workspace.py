@@ -0,0 +1,85 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v2rayHelper import Workspace  # noqa: E402
+
+# holds the lock of its own workspace like a run does, until stdin is closed
+HOLDER = '''
+import fcntl, os, sys
+with open(os.path.join(sys.argv[1], 'run-{}.lock'.format(os.getpid())), 'w') as file:
+    fcntl.flock(file, fcntl.LOCK_EX)
+    os.mkdir(os.path.join(sys.argv[1], 'run-{}'.format(os.getpid())))
+    print('locked', flush=True)
+    sys.stdin.read()
+'''
+
+
+class WorkspaceTest(unittest.TestCase):
+    def setUp(self):
+        self.base = os.path.join(tempfile.mkdtemp(), Workspace.BASE_DIR)
+        self.addCleanup(shutil.rmtree, os.path.dirname(self.base), True)
+        os.mkdir(self.base)
+
+    def _spawn(self, script):
+        process = subprocess.Popen([sys.executable, '-c', script, self.base], stdin=subprocess.PIPE,
+                                   stdout=subprocess.PIPE, universal_newlines=True)
+        self.addCleanup(process.wait)
+        self.addCleanup(process.stdin.close)
+        self.addCleanup(process.stdout.close)
+
+        return process
+
+    def _leave(self, pid, folder=True):
+        path = os.path.join(self.base, 'run-{}'.format(pid))
+        if folder:
+            os.mkdir(path)
+            open(os.path.join(path, 'v2ray.zip'), 'w').close()
+        open('{}.lock'.format(path), 'w').close()
+
+    def test_dead_runs_are_removed(self):
+        process = subprocess.Popen(['true'])
+        process.wait()
+        self._leave(process.pid)
+
+        Workspace._remove_stale(self.base)
+        self.assertEqual([], os.listdir(self.base))
+
+    def test_locked_runs_are_kept(self):
+        process = self._spawn(HOLDER)
+        self.assertEqual('locked', process.stdout.readline().strip())
+
+        Workspace._remove_stale(self.base)
+        self.assertEqual(['run-{}'.format(process.pid), 'run-{}.lock'.format(process.pid)],
+                         sorted(os.listdir(self.base)))
+
+    def test_reused_pids_are_removed(self):
+        # the pid is alive, but the process does not hold the lock
+        process = self._spawn('import sys; sys.stdin.read()')
+        self._leave(process.pid)
+
+        Workspace._remove_stale(self.base)
+        self.assertEqual(['run-{}.lock'.format(process.pid)], os.listdir(self.base))
+
+    def test_starting_runs_are_kept(self):
+        # a live run may have created its lock file, but not taken the lock yet
+        process = self._spawn('import sys; sys.stdin.read()')
+        self._leave(process.pid, False)
+
+        Workspace._remove_stale(self.base)
+        self.assertEqual(['run-{}.lock'.format(process.pid)], os.listdir(self.base))
+
+    def test_prepare_base(self):
+        base = os.path.join(self.base, 'new')
+
+        self.assertEqual(base, Workspace._prepare_base(base))
+        self.assertEqual(0o1777, os.stat(base).st_mode & 0o7777)
+
+
+if __name__ == '__main__':
+    unittest.main()